@@ -1,4 +1,6 @@
 import time
+import sys
+from lps_ctrl.target_set import TargetGroups
 from winrt.windows.devices.bluetooth.advertisement import (
     BluetoothLEAdvertisementPublisher,
     BluetoothLEAdvertisementWatcher,
@@ -22,15 +24,18 @@ STATE_MAP = {
 UUID1 = 0x4C
 UUID2 = 0x44
 
-# Global set to filter duplicate reports within a single scan window
-seen_devices = set()
+# Optional JSON file with named target groups, e.g. {"groups": {"front": [1, 2, 3]}}
+GROUPS_FILE = sys.argv[1] if len(sys.argv) > 1 else None
+
+# Bitmask of player IDs already reported within a single scan window
+seen_mask = 0
 
 def on_advertisement_received(sender, args):
     """
     Callback function triggered when a BLE advertisement is detected.
     Filters for our custom ACK packet (Manufacturer Data 0xFFFF -> LD 0x07)
     """
-    global seen_devices
+    global seen_mask
     adv = args.advertisement
     for man_data in adv.manufacturer_data:
         # Check for our specific Company ID (0xFFFF)
@@ -45,9 +50,9 @@ def on_advertisement_received(sender, args):
                 player_id = data_bytes[3]
                 
                 # Deduplication check
-                if player_id in seen_devices:
+                if seen_mask & (1 << player_id):
                     return
-                seen_devices.add(player_id)
+                seen_mask |= (1 << player_id)
                 
                 cmd_id = data_bytes[4]
                 cmd_type = data_bytes[5]
@@ -61,15 +66,15 @@ def on_advertisement_received(sender, args):
                 print(f"   [REPORT] Player {player_id:02d} | State: {state_name} | Locked CMD: {cmd_name} (ID:{cmd_id}) | Remaining Delay: {delay_ms}ms | RSSI: {rssi}dBm")
 
 
-def create_payload(cmd_id, cmd_type, target_mask, delay_ms=2000, prep_ms=1000, extra_data=b''):
+def create_payload(cmd_id, cmd_type, targets, delay_ms=2000, prep_ms=1000, extra_data=b''):
     # 1. Magic Bytes (2 Bytes): "LD" (0x4C, 0x44 for ESP32)
     magic_bytes = b'\x4C\x44'
     
     # 2. CMD Info (1 Byte): High 4-bit is CMD_ID, Low 4-bit is CMD_TYPE
     cmd_info = ((cmd_id & 0x0F) << 4) | (cmd_type & 0x0F)
     
-    # 3. Target Mask (8 Bytes, Little Endian)
-    mask_bytes = target_mask.to_bytes(8, byteorder='little')
+    # 3. Target Mask (8 Bytes, Little Endian), cached on the TargetSet
+    mask_bytes = targets.le_bytes
     
     # 4. Delay Time (4 Bytes, Big Endian) in milliseconds (ms)
     delay_bytes = delay_ms.to_bytes(4, byteorder='big')
@@ -89,7 +94,8 @@ def create_payload(cmd_id, cmd_type, target_mask, delay_ms=2000, prep_ms=1000, e
     return magic_bytes + bytes([cmd_info]) + mask_bytes + delay_bytes + bytes(spec_bytes)
 
 def main():
-    global seen_devices
+    global seen_mask
+    groups = TargetGroups.from_file(GROUPS_FILE) if GROUPS_FILE else TargetGroups()
     # Initialize Publisher
     publisher = BluetoothLEAdvertisementPublisher()
     
@@ -117,22 +123,19 @@ def main():
                 continue
                 
             # --- 2. Enter Target IDs ---
-            target_input = input("Enter Target IDs (e.g., 0,1,2), or 'all' to broadcast to all: ").strip()
-            target_mask = 0
-            
-            if target_input.lower() == 'all':
-                target_mask = 0xFFFFFFFFFFFFFFFF
-            else:
-                target_list = target_input.split(',')
-                for tid_str in target_list:
-                    if tid_str.strip():
-                        tid = int(tid_str.strip())
-                        if 0 <= tid <= 63:
-                            target_mask |= (1 << tid)
-                        else:
-                            print(f"Warning: Target ID {tid} is out of range (0-63) and will be ignored.")
+            if len(groups):
+                print("Available Groups:", ", ".join(groups.names()))
+            target_input = input("Enter Target IDs or group names (e.g., 0,1,2), or 'all' to broadcast to all: ").strip()
+            if not target_input:
+                print("Error: No valid targets specified!")
+                continue
+            try:
+                targets = groups.resolve(target_input)
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
             
-            if target_mask == 0:
+            if not targets:
                 print("Error: No valid targets specified!")
                 continue
 
@@ -163,7 +166,7 @@ def main():
                     extra_data = bytes([cancel_id & 0x0F])
 
             # Generate Payload
-            payload = create_payload(current_cmd_id, cmd_type, target_mask, delay_ms, prep_ms, extra_data=extra_data)
+            payload = create_payload(current_cmd_id, cmd_type, targets, delay_ms, prep_ms, extra_data=extra_data)
             
             # --- 5. Update and Broadcast ---
             if publisher.status == 2:
@@ -195,8 +198,8 @@ def main():
                 listen_time = (delay_ms / 1000.0) + 1.5
                 print(f"\n[INFO] Broadcast sent. Listening for device reports for {listen_time:.1f} seconds...")
                 
-                # Clear the seen devices set before starting a new scan
-                seen_devices.clear()
+                # Clear the seen devices mask before starting a new scan
+                seen_mask = 0
                 
                 watcher.start()
                 time.sleep(listen_time)
@@ -209,7 +212,7 @@ def main():
                 print(f"\n[INFO] Broadcast sent!")
             
             print(f"   Command: {COMMANDS[cmd_type]} (CMD_ID: {current_cmd_id})")
-            print(f"   Target Mask: {hex(target_mask)}")
+            print(f"   Target Mask: 0x{targets.hex}")
             print(f"   Delay: {delay_ms}ms" + (f", Prep: {prep_ms}ms" if cmd_type == 1 else ""))
             print(f"   Raw Payload (Hex): {payload.hex().upper()}")
             
@@ -1,2 +1,11 @@
-from .lps_ctrl import ESP32BTSender
-from .tcp_sender import Esp32TcpServer
\ No newline at end of file
+from .tcp_sender import Esp32TcpServer
+from .target_set import TargetSet, TargetGroups
+
+__all__ = ["ESP32BTSender", "Esp32TcpServer", "TargetSet", "TargetGroups"]
+
+def __getattr__(name):
+    # ESP32BTSender needs pyserial; load it on first use so target_set works without it
+    if name == "ESP32BTSender":
+        from .lps_ctrl import ESP32BTSender
+        return ESP32BTSender
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -3,6 +3,8 @@ import time
 import logging
 import json
 
+from .target_set import MAX_TARGETS, TargetSet, TargetGroups
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -13,13 +15,21 @@ class ESP32BTSender:
     # Maps internal state integers to readable strings for reporting
     STATE_MAP = { 0: "UNLOADED", 1: "READY", 2: "PLAYING", 3: "PAUSE", 4: "TEST" }
 
-    def __init__(self, port, baud_rate=115200, timeout=1):
+    def __init__(self, port, baud_rate=115200, timeout=1, groups=None):
         self.port = port
         self.baud_rate = baud_rate
         self.timeout = timeout
         self.ser = None
+        # Named target groups; accepts a TargetGroups, a {name: ids} dict or a JSON config path
+        if groups is None or isinstance(groups, TargetGroups):
+            self.groups = groups or TargetGroups()
+        elif isinstance(groups, dict):
+            self.groups = TargetGroups(groups)
+        else:
+            self.groups = TargetGroups.from_file(groups)
         
         self.found_devices_buffer = [] # Buffer to store ACK reports from receivers
+        self.found_mask = 0            # Bitmask of target IDs present in found_devices_buffer
         self.cmd_list = [0] * 16       # Tracks execution timestamps for the 16 command slots
         self.idx = -1                  # Current command slot index
 
@@ -53,6 +63,10 @@ class ESP32BTSender:
             }
         }
 
+    def resolve_targets(self, target_ids):
+        """Converts any accepted `target_ids` form (list, TargetSet, group name) to a TargetSet."""
+        return self.groups.resolve(target_ids)
+
     def _read_until_ack_or_timeout(self, expected_ack="ACK:OK", timeout=1.0):
         """Reads serial data until the expected ACK is received or timeout occurs."""
         start_time = time.time()
@@ -92,11 +106,15 @@ class ESP32BTSender:
         try:
             parts = line.replace("FOUND:", "").split(',')
             if len(parts) >= 5:
+                target_id = int(parts[0])
                 state = self.STATE_MAP.get(int(parts[4]), "UNKNOWN")
                 cmd_type = self.CMD_MAP_INV.get(int(parts[2]), "UNKNOWN")
                 current_time = time.time()
+                # IDs outside 0-63 (raw uint8 from the firmware) are kept in the report but not in found_mask
+                in_range = 0 <= target_id < MAX_TARGETS
+                bit = (1 << target_id) if in_range else 0
                 packet = {
-                    "target_id": int(parts[0]),
+                    "target_id": target_id,
                     "cmd_id": int(parts[1]),
                     "cmd_type": cmd_type,
                     "target_delay": int(parts[3]),
@@ -105,15 +123,19 @@ class ESP32BTSender:
                 }
                 if not self.found_devices_buffer:
                     self.found_devices_buffer.append(packet)
+                    self.found_mask = bit
                 else:
                     first_ts = self.found_devices_buffer[0]["timestamp"]
                     
                     if current_time - first_ts > 1.0:
                         self.found_devices_buffer = [packet]
-                    else:
-                        is_duplicate = any(p["target_id"] == int(parts[0]) for p in self.found_devices_buffer)
-                        if not is_duplicate:
+                        self.found_mask = bit
+                    elif in_range:
+                        if not self.found_mask & bit:
                             self.found_devices_buffer.append(packet)
+                            self.found_mask |= bit
+                    elif not any(p["target_id"] == target_id for p in self.found_devices_buffer):
+                        self.found_devices_buffer.append(packet)
         except Exception as e:
             logger.error(f"Parse error: {e}")
 
@@ -130,17 +152,17 @@ class ESP32BTSender:
         if not self.ser or not self.ser.is_open:
             return error_response
 
+        try:
+            targets = self.resolve_targets(target_ids)
+        except ValueError as e:
+            return self._format_response(-1, cmd_input, target_ids, -1, f"Invalid targets: {e}")
+        if not targets:
+            return self._format_response(-1, cmd_input, target_ids, -1, "No targets")
+
         cmd_int = cmd_input if isinstance(cmd_input, int) else self.CMD_MAP.get(cmd_input, 0)
         delay_ms = int(delay_sec * 1000)
         prep_led_ms = int(prep_led_sec * 1000)
         
-        target_mask = 0
-        if not target_ids:
-            target_mask = 0xFFFFFFFFFFFFFFFF 
-        else:
-            for pid in target_ids:
-                target_mask |= (1 << pid)
-        
         t_start_pc = time.perf_counter()
         target_time = t_start_pc + delay_sec
         add_cmd_fail = 1
@@ -150,7 +172,7 @@ class ESP32BTSender:
             if self.cmd_list[i] < t_start_pc and i != self.idx:
                 self.cmd_list[i] = target_time
                 cmd_int = i * 16 + cmd_int 
-                packet = f"{cmd_int},{delay_ms},{prep_led_ms},{target_mask:x},{data[0]},{data[1]},{data[2]}\n"
+                packet = f"{cmd_int},{delay_ms},{prep_led_ms},{targets.hex},{data[0]},{data[1]},{data[2]}\n"
                 add_cmd_fail = 0
                 self.idx = i
                 break 
@@ -188,6 +210,11 @@ class ESP32BTSender:
             }
         }
 
+    def get_responded_targets(self):
+        """Returns the IDs reported by the latest CHECK scan as a TargetSet."""
+        self._drain_serial()
+        return TargetSet(self.found_mask)
+
     def get_latest_report(self):
         """Fetches the aggregated status report after a CHECK scan."""
         self._drain_serial() # Ensure all pending data is read
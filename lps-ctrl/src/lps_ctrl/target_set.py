@@ -0,0 +1,253 @@
+import json
+
+MAX_TARGETS = 64
+FULL_MASK = (1 << MAX_TARGETS) - 1
+
+class TargetSet:
+    """Immutable set of receiver IDs (0-63) backed by the 64-bit target mask."""
+    __slots__ = ("_mask", "_hex", "_le_bytes")
+
+    def __init__(self, mask=0):
+        if not isinstance(mask, int) or mask < 0 or mask > FULL_MASK:
+            raise ValueError(f"Target mask must fit in {MAX_TARGETS} bits: {mask!r}")
+        self._mask = mask
+        self._hex = None       # Cached serial encoding (lowercase hex, no prefix)
+        self._le_bytes = None  # Cached BLE encoding (8 bytes, little endian)
+
+    @classmethod
+    def from_ids(cls, ids):
+        """Builds a set from an iterable of player IDs."""
+        mask = 0
+        for pid in ids:
+            pid = _as_id(pid)
+            if pid is None:
+                raise ValueError("Target IDs must be integers")
+            if not 0 <= pid < MAX_TARGETS:
+                raise ValueError(f"Target ID {pid} is out of range (0-{MAX_TARGETS - 1})")
+            mask |= (1 << pid)
+        return cls(mask)
+
+    @property
+    def mask(self):
+        return self._mask
+
+    @property
+    def hex(self):
+        if self._hex is None:
+            self._hex = f"{self._mask:x}"
+        return self._hex
+
+    @property
+    def le_bytes(self):
+        if self._le_bytes is None:
+            self._le_bytes = self._mask.to_bytes(8, byteorder='little')
+        return self._le_bytes
+
+    @property
+    def ids(self):
+        """Sorted list of member IDs."""
+        return list(self)
+
+    # --- Set algebra (single integer operations) ---
+    def __or__(self, other):
+        return TargetSet(self._mask | _mask_of(other))
+
+    def __and__(self, other):
+        return TargetSet(self._mask & _mask_of(other))
+
+    def __sub__(self, other):
+        return TargetSet(self._mask & ~_mask_of(other))
+
+    def __xor__(self, other):
+        return TargetSet(self._mask ^ _mask_of(other))
+
+    def __invert__(self):
+        return TargetSet(self._mask ^ FULL_MASK)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+    complement = __invert__
+
+    def issubset(self, other):
+        return self._mask & ~_mask_of(other) == 0
+
+    def covers(self, other):
+        """True if every ID in `other` is also in this set."""
+        return _mask_of(other) & ~self._mask == 0
+
+    def missing(self, responded):
+        """IDs in this set that are absent from `responded` (e.g. a CHECK result)."""
+        return self - responded
+
+    # --- Container protocol ---
+    def __contains__(self, pid):
+        return isinstance(pid, int) and 0 <= pid < MAX_TARGETS and (self._mask >> pid) & 1 == 1
+
+    def __iter__(self):
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self):
+        return self._mask.bit_count()
+
+    def __bool__(self):
+        return self._mask != 0
+
+    def __eq__(self, other):
+        if isinstance(other, TargetSet):
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._mask)
+
+    def __str__(self):
+        # Keeps the JSON "target_id" field identical to passing a plain list
+        return str(self.ids)
+
+    def __repr__(self):
+        return f"TargetSet(0x{self._mask:016x})"
+
+
+TargetSet.NONE = TargetSet(0)
+TargetSet.ALL = TargetSet(FULL_MASK)
+
+
+def _mask_of(value):
+    if isinstance(value, TargetSet):
+        return value.mask
+    if isinstance(value, int):
+        return TargetSet(value).mask
+    return TargetSet.from_ids(value).mask
+
+
+def _as_id(token):
+    """Returns the int for an int or numeric string, None for any other string."""
+    if isinstance(token, int) and not isinstance(token, bool):
+        return token
+    if not isinstance(token, str):
+        raise ValueError(f"Invalid target: {token!r}")
+    token = token.strip()
+    digits = token[1:] if token[:1] in '+-' else token
+    if digits.isascii() and digits.isdigit():
+        return int(token)
+    return None
+
+
+class TargetGroups:
+    """Named target groups (formations, sections, ...) precomputed once from a config.
+
+    The name 'all' is reserved for broadcast, and numeric names are reserved for
+    player IDs; neither can be defined as a group.
+    """
+
+    def __init__(self, groups=None):
+        self._groups = {}
+        groups = groups or {}
+        for name in groups:
+            if not isinstance(name, str) or _as_id(name) is not None:
+                raise ValueError(f"Group name {name!r} is reserved for player IDs")
+            if name.lower() == 'all':
+                raise ValueError("Group name 'all' is reserved for broadcast")
+        for name, members in groups.items():
+            self._groups[name] = self._build(name, members, groups, ())
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads groups from a JSON file: {"groups": {"name": [ids or group names], ...}}."""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get("groups", config))
+
+    def _build(self, name, members, raw, stack):
+        """Resolves one group, expanding references to other groups."""
+        if name in self._groups:
+            return self._groups[name]
+        if name in stack:
+            raise ValueError(f"Circular group reference: {' -> '.join(stack + (name,))}")
+        if isinstance(members, str):
+            members = [members]
+        elif not isinstance(members, (list, tuple)):
+            raise ValueError(f"Group '{name}' must be a list of IDs or group names: {members!r}")
+        mask = 0
+        for item in members:
+            if isinstance(item, str):
+                if item.lower() == 'all':
+                    mask |= FULL_MASK
+                elif item in raw:
+                    mask |= self._build(item, raw[item], raw, stack + (name,)).mask
+                else:
+                    raise ValueError(f"Group '{name}' references unknown group '{item}'")
+            elif isinstance(item, int) and not isinstance(item, bool):
+                mask |= TargetSet.from_ids([item]).mask
+            else:
+                raise ValueError(f"Group '{name}' has invalid member: {item!r}")
+        targets = TargetSet(mask)
+        self._groups[name] = targets
+        return targets
+
+    def __getitem__(self, name):
+        try:
+            return self._groups[name]
+        except KeyError:
+            raise KeyError(f"Unknown target group: {name}") from None
+
+    def __contains__(self, name):
+        return name in self._groups
+
+    def __iter__(self):
+        return iter(self._groups)
+
+    def __len__(self):
+        return len(self._groups)
+
+    def names(self):
+        return list(self._groups)
+
+    def resolve(self, spec):
+        """Turns any accepted `target_ids` value into a TargetSet.
+
+        Accepts a TargetSet, 'all', a group name, a comma list of IDs/names, or a
+        list of IDs/names/TargetSets. None or an empty list means broadcast to all;
+        an empty TargetSet is returned as-is. A single group name returns the
+        precomputed group so its cached encodings are reused.
+        """
+        if isinstance(spec, TargetSet):
+            return spec
+        if spec is None:
+            return TargetSet.ALL
+        if isinstance(spec, str):
+            items = [tok.strip() for tok in spec.split(',') if tok.strip()]
+            if not items:
+                raise ValueError(f"No targets specified: {spec!r}")
+        else:
+            try:
+                items = list(spec)
+            except TypeError:
+                raise ValueError(f"Invalid targets: {spec!r}") from None
+            if not items:
+                return TargetSet.ALL
+        if len(items) == 1:
+            return self._resolve_one(items[0])
+        mask = 0
+        for item in items:
+            mask |= self._resolve_one(item).mask
+        return TargetSet(mask)
+
+    def _resolve_one(self, item):
+        """Resolves a single ID, group name, 'all' or TargetSet."""
+        if isinstance(item, TargetSet):
+            return item
+        pid = _as_id(item)
+        if pid is not None:
+            return TargetSet.from_ids([pid])
+        name = item.strip()
+        if name in self._groups:
+            return self._groups[name]
+        if name.lower() == 'all':
+            return TargetSet.ALL
+        raise ValueError(f"Unknown target group: {name}")
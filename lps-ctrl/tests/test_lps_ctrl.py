@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+from lps_ctrl import ESP32BTSender, TargetSet
+
+
+def test_found_lines_build_responded_mask():
+    sender = ESP32BTSender(port=None)
+    sender._parse_found_line("FOUND:3,1,7,1,1")
+    sender._parse_found_line("FOUND:3,1,7,1,1")
+    sender._parse_found_line("FOUND:5,1,7,1,1")
+    assert sender.get_responded_targets() == TargetSet.from_ids([3, 5])
+    assert [d["target_id"] for d in sender.found_devices_buffer] == [3, 5]
+
+
+def test_found_out_of_range_ids_stay_in_report_only():
+    sender = ESP32BTSender(port=None)
+    sender._parse_found_line("FOUND:99,1,7,1,1")
+    sender._parse_found_line("FOUND:99,1,7,1,1")
+    sender._parse_found_line("FOUND:-1,1,7,1,1")
+    sender._parse_found_line("FOUND:2,1,7,1,1")
+    assert sender.get_responded_targets() == TargetSet.from_ids([2])
+    report = sender.get_latest_report()
+    assert [d["target_id"] for d in report["payload"]["found_devices"]] == [99, -1, 2]
+
+
+def test_resolve_targets_uses_groups():
+    sender = ESP32BTSender(port=None, groups={"front": [1, 2]})
+    assert sender.resolve_targets(None) == TargetSet.ALL
+    assert sender.resolve_targets([]) == TargetSet.ALL
+    assert sender.resolve_targets("front").ids == [1, 2]
+    assert sender.resolve_targets([4]).ids == [4]
+
+
+def test_invalid_targets_return_error_response():
+    sender = ESP32BTSender(port=None)
+    sender.ser = type("OpenPort", (), {"is_open": True, "in_waiting": 0})()
+    for target_ids in (",", [None], "missing"):
+        resp = sender.send_burst(cmd_input='PLAY', delay_sec=2, target_ids=target_ids)
+        assert resp["statusCode"] == -1
+        assert resp["payload"]["message"].startswith("Invalid targets: ")
+    assert "'" not in sender.send_burst(cmd_input='PLAY', delay_sec=2, target_ids="missing")["payload"]["message"]
+
+
+def test_target_set_imports_without_pyserial():
+    code = "import sys; sys.modules['serial'] = None; from lps_ctrl.target_set import TargetGroups; import lps_ctrl"
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), "..", "src"))
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
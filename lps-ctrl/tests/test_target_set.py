@@ -0,0 +1,115 @@
+import pytest
+
+from lps_ctrl.target_set import FULL_MASK, TargetGroups, TargetSet
+
+
+def test_from_ids_and_encodings():
+    t = TargetSet.from_ids([1, 2, 5])
+    assert t.mask == 0b100110
+    assert t.hex == "26"
+    assert t.le_bytes == bytes([0x26, 0, 0, 0, 0, 0, 0, 0])
+    assert t.ids == [1, 2, 5]
+    assert str(t) == "[1, 2, 5]"
+
+
+def test_from_ids_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        TargetSet.from_ids([64])
+    with pytest.raises(ValueError):
+        TargetSet.from_ids([-1])
+
+
+def test_set_algebra():
+    group = TargetSet.from_ids([1, 2, 3])
+    responded = TargetSet.from_ids([2])
+    assert group - responded == TargetSet.from_ids([1, 3])
+    assert group.missing(responded) == TargetSet.from_ids([1, 3])
+    assert (group | [4]).ids == [1, 2, 3, 4]
+    assert len(~group) == 61
+    assert group.covers(responded)
+    assert responded.issubset(group)
+
+
+def test_int_operands_are_validated():
+    t = TargetSet.from_ids([1])
+    with pytest.raises(ValueError):
+        t | (1 << 70)
+    with pytest.raises(ValueError):
+        t | -1
+
+
+def test_contains():
+    t = TargetSet.from_ids([3])
+    assert 3 in t
+    assert 4 not in t
+    assert 64 not in t
+    assert 'x' not in t
+
+
+def test_groups_expand_references():
+    groups = TargetGroups({"front": [1, 2], "back": [3], "stage": ["front", "back"]})
+    assert groups["stage"].ids == [1, 2, 3]
+
+
+def test_groups_reject_bad_config():
+    with pytest.raises(ValueError):
+        TargetGroups({"x": 5})
+    with pytest.raises(ValueError):
+        TargetGroups({"x": [1.5]})
+    with pytest.raises(ValueError):
+        TargetGroups({"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError):
+        TargetGroups({"a": ["missing"]})
+    with pytest.raises(ValueError):
+        TargetGroups({"all": [1]})
+    with pytest.raises(ValueError):
+        TargetGroups({"1": [5]})
+    with pytest.raises(ValueError):
+        TargetGroups({"x": [True]})
+
+
+def test_groups_all_member_is_broadcast():
+    groups = TargetGroups({"everyone": ["all"]})
+    assert groups["everyone"].mask == FULL_MASK
+
+
+def test_resolve():
+    groups = TargetGroups({"front": [1, 2]})
+    assert groups.resolve(None) == TargetSet.ALL
+    assert groups.resolve([]) == TargetSet.ALL
+    assert groups.resolve("all") == TargetSet.ALL
+    assert groups.resolve("front, 7").ids == [1, 2, 7]
+    assert groups.resolve(["front", 0]).ids == [0, 1, 2]
+    assert groups.resolve(TargetSet.NONE) == TargetSet.NONE
+    with pytest.raises(ValueError, match="out of range"):
+        groups.resolve("-1")
+    with pytest.raises(ValueError, match="Unknown target group"):
+        groups.resolve("back")
+
+
+@pytest.mark.parametrize("spec", [",", ", ,", " "])
+def test_resolve_rejects_empty_string(spec):
+    with pytest.raises(ValueError):
+        TargetGroups().resolve(spec)
+
+
+@pytest.mark.parametrize("spec", [[1.9], [None], [[1]], [True], 5])
+def test_resolve_rejects_non_integer_ids(spec):
+    with pytest.raises(ValueError):
+        TargetGroups().resolve(spec)
+
+
+def test_from_ids_rejects_non_integer_ids():
+    with pytest.raises(ValueError):
+        TargetSet.from_ids([2.7])
+    assert TargetSet.from_ids(["3"]).ids == [3]
+
+
+def test_resolve_reuses_precomputed_sets():
+    groups = TargetGroups({"front": [1, 2]})
+    front = groups["front"]
+    assert groups.resolve("front") is front
+    assert groups.resolve(" front ") is front
+    assert groups.resolve(["front"]) is front
+    assert groups.resolve("all") is TargetSet.ALL
+    assert groups.resolve([front]) is front